@@ -6,5 +6,38 @@ Provide an API for parsing SnapGene *.dna files.
 
 __version__ = '0.1.0'
 
-from .api import *
+def __getattr__(name):
+    # Importing the API is relatively slow (mostly because of its 
+    # dependencies), so don't do it until something from it is actually 
+    # needed.  This keeps the command-line help and usage errors snappy.
+    #
+    # Note that `from . import api` would recurse back into this function.
+    from importlib import import_module
+    api = import_module('.api', __name__)
 
+    # Importing the API also binds any submodules it loads (e.g. `api`, 
+    # `parser`, `errors`) as attributes of this package.
+    if name == '__all__':
+        return sorted({
+                x for x in {*globals(), *dir(api)}
+                if not x.startswith('_')
+        })
+    if name in globals():
+        return globals()[name]
+
+    try:
+        return getattr(api, name)
+    except AttributeError:
+        pass
+
+    # Fall back on importing a submodule that the API doesn't use.
+    try:
+        return import_module(f'.{name}', __name__)
+    except ModuleNotFoundError as err:
+        if err.name != f'{__name__}.{name}':
+            raise
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+def __dir__():
+    return sorted({*globals(), *__getattr__('__all__')})
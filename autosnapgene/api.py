@@ -2,8 +2,6 @@
 
 import autoprop
 from pathlib import Path
-from copy import deepcopy
-from more_itertools import one
 from . import parser, blocks
 
 # Import classes that should be part of the public API:
@@ -12,13 +10,13 @@ from .blocks import Feature, FeatureSegment
 from .blocks import Reference
 from .errors import *
 
-def parse(path, block_classes=None):
+def parse(path, block_classes=None, executor=None):
     """
     Parse the given file and return a `SnapGene` object.
 
     This is an alias for ``Snapgene(path)``.
     """
-    return SnapGene(path)
+    return SnapGene(path, executor=executor)
 
 def write(path, dna):
     """
@@ -31,9 +29,9 @@ def write(path, dna):
 @autoprop
 class SnapGene:
 
-    def __init__(self, path=None):
+    def __init__(self, path=None, executor=None):
         if path:
-            self.parse(path)
+            self.parse(path, executor=executor)
         else:
             self.reset()
 
@@ -44,8 +42,19 @@ class SnapGene:
         ]
         self.input_path = None
 
-    def parse(self, path, block_classes=None):
-        self.blocks = parser.blocks_from_file(path, block_classes)
+    def parse(self, path, block_classes=None, executor=None):
+        """
+        Read the blocks from the given file.
+
+        Normally blocks aren't parsed until they're needed.  But if an 
+        *executor* (e.g. a `concurrent.futures.ProcessPoolExecutor`) is 
+        given, every block is parsed right away, in parallel.
+        """
+        self.blocks = parser.blocks_from_file(
+                path, block_classes,
+                lazy=executor is None,
+                executor=executor,
+        )
         self.input_path = Path(path)
 
     def write(self, path=None):
@@ -55,25 +64,51 @@ class SnapGene:
             raise ValueError("not originally parsed from *.dna file, output path required.")
 
         # Make sure there's a header.
-        assert isinstance(self.blocks[0], blocks.HeaderBlock)
+        assert isinstance(self._blocks[0], blocks.HeaderBlock)
+
+        # Any blocks that were never parsed are written back unchanged.
+        parser.file_from_blocks(path, self._blocks)
+
+
+    @property
+    def blocks(self):
+        """
+        The list of blocks making up this file.
 
-        parser.file_from_blocks(path, self.blocks)
+        The blocks are indexed by class to make `find_blocks()` fast.  This is 
+        the live list, so the index is dropped whenever the list is handed out, 
+        in case the caller modifies it in place.  Don't hold onto the list 
+        across calls to `find_blocks()` and modify it later, though.
+        """
+        self._parse_deferred_blocks(parser.Block)
+        self._block_index = {}
+        self._seq_blocks_by_id = None
+        return self._blocks
 
+    @blocks.setter
+    def blocks(self, blocks):
+        self._blocks = blocks
+        self._block_index = {}
+        self._seq_blocks_by_id = None
 
     def make_block(self, cls):
         block = cls()
-        self.blocks.append(block)
+        self._append_block(block)
         return block
 
     def find_blocks(self, cls):
-        return [x for x in self.blocks if isinstance(x, cls)]
+        # Return a copy so the cache can't be modified by the caller.
+        return self._find_indexed_blocks(cls)[:]
 
     def find_block(self, cls):
-        return one(
-                self.find_blocks(cls),
-                too_short=BlockNotFound(f"{self._this_seq} doesn't have any {cls.__name__} blocks."),
-                too_long=AssertionError,
-        )
+        hits = self._find_indexed_blocks(cls)
+
+        if len(hits) == 1:
+            return hits[0]
+        if not hits:
+            raise BlockNotFound(f"{self._this_seq} doesn't have any {cls.__name__} blocks.")
+
+        raise AssertionError(f"{self._this_seq} has {len(hits)} {cls.__name__} blocks, expected 1.")
 
     def find_or_make_block(self, cls):
         try:
@@ -82,15 +117,83 @@ class SnapGene:
             return self.make_block(cls)
 
     def remove_blocks(self, cls):
-        self.blocks = [x for x in self.blocks if not isinstance(x, cls)]
+        self._parse_deferred_blocks(cls)
+        self.blocks = [x for x in self._blocks if not isinstance(x, cls)]
 
     def remove_block(self, cls):
         try:
             block = self.find_block(cls)
-            self.blocks.remove(block)
+            self._remove_block(block)
         except BlockNotFound:
             pass
 
+    def _find_indexed_blocks(self, cls):
+        # Lookups are cached by class, so each class only requires one scan 
+        # over all the blocks.  Don't modify the returned list.
+        try:
+            return self._block_index[cls]
+        except KeyError:
+            self._parse_deferred_blocks(cls)
+            hits = self._block_index[cls] = [
+                    x for x in self._blocks if isinstance(x, cls)
+            ]
+            return hits
+
+    def _append_block(self, block):
+        self._blocks.append(block)
+        for cls, hits in self._block_index.items():
+            if isinstance(block, cls):
+                hits.append(block)
+
+        if isinstance(block, blocks.AlignedSequenceBlock):
+            self._seq_blocks_by_id = None
+
+    def _remove_block(self, block):
+        self._blocks.remove(block)
+        for cls, hits in self._block_index.items():
+            if isinstance(block, cls):
+                hits.remove(block)
+
+        if isinstance(block, blocks.AlignedSequenceBlock):
+            self._seq_blocks_by_id = None
+
+    def _remove_blocks_by_id(self, ids):
+        # Remove every block whose `id()` is in the given set in one pass, and 
+        # update the index rather than throwing it away.
+        self._blocks = [x for x in self._blocks if id(x) not in ids]
+        for hits in self._block_index.values():
+            hits[:] = [x for x in hits if id(x) not in ids]
+
+        self._seq_blocks_by_id = None
+
+    def _parse_deferred_blocks(self, cls):
+        # Blocks that are expensive to parse are only parsed once they're 
+        # needed.  Any index entry that could include a deferred block of the 
+        # given class would have been made by calling this method first, so 
+        # replacing the placeholders doesn't invalidate the index.
+        for i, block in enumerate(self._blocks):
+            if not isinstance(block, parser.DeferredBlock):
+                continue
+            if not issubclass(block.cls, cls):
+                continue
+
+            try:
+                self._blocks[i] = block.parse()
+            except ParseError as e:
+                e.path = self.input_path
+                raise e from None
+
+    def _find_seq_blocks_by_id(self):
+        # This mapping is needed every time a trace is added, removed, or 
+        # extracted, so cache it.  Any code that changes the id of an 
+        # AlignedSequenceBlock must reset the cache.
+        if self._seq_blocks_by_id is None:
+            self._seq_blocks_by_id = {
+                    block.id: block
+                    for block in self.find_blocks(blocks.AlignedSequenceBlock)
+            }
+        return self._seq_blocks_by_id
+
     # DNA
 
     def get_sequence(self):
@@ -103,10 +206,7 @@ class SnapGene:
         file doesn't contain either type of sequence, a `BlockNotFound` 
         exception will be raised.
         """
-        try:
-            return self.dna_sequence
-        except BlockNotFound:
-            return self.protein_sequence
+        return self._find_seq_block().sequence
 
     def set_sequence(self, value):
         """
@@ -115,13 +215,35 @@ class SnapGene:
         If the file does not yet contain a sequence, the DNA sequence will be 
         set.
         """
+        self._find_or_make_seq_block().sequence = value
+
+    def get_sequence_bytes(self):
+        """
+        Get the DNA or protein sequence stored in this file, as ASCII bytes.
+
+        This is the same as `get_sequence()`, except that the sequence doesn't 
+        need to be decoded.  This can save time and memory for very long 
+        sequences.
+        """
+        return self._find_seq_block().sequence_bytes
+
+    def set_sequence_bytes(self, value):
+        """
+        Set the DNA or protein sequence stored in this file from ASCII bytes.
+        """
+        self._find_or_make_seq_block().sequence_bytes = value
+
+    def _find_seq_block(self):
         try:
-            self.find_block(blocks.DnaBlock).sequence = value
+            return self.find_block(blocks.DnaBlock)
         except BlockNotFound:
-            try:
-                self.find_block(blocks.ProteinBlock).sequence = value
-            except BlockNotFound:
-                self.make_block(blocks.DnaBlock).sequence = value
+            return self.find_block(blocks.ProteinBlock)
+
+    def _find_or_make_seq_block(self):
+        try:
+            return self._find_seq_block()
+        except BlockNotFound:
+            return self.make_block(blocks.DnaBlock)
 
     def get_topology(self):
         return self.find_block(blocks.DnaBlock).topology
@@ -219,19 +341,21 @@ class SnapGene:
         new_features = []
 
         if not seq:
-            feature.id = block.next_id
             new_features.append(feature)
 
         else:
-            import re, copy
+            # Find all occurrences of the given sequence.  Restart each search 
+            # one position after the previous hit to allow overlapping matches.
 
-            # Find all occurrences of the given sequence.
+            seq_block = self._find_seq_block()
+            haystack, needle = seq_block.upper_sequence, seq.upper()
+            positions = []
+            i = haystack.find(needle)
+
+            while i >= 0:
+                positions.append(i)
+                i = haystack.find(needle, i + 1)
 
-            positions = [
-                    m.start()
-                    # Use lookahead to allow overlapping matches.
-                    for m in re.finditer(f'(?={seq.upper()})', self.sequence.upper())
-            ]
             if not positions:
                 raise SequenceNotFound(f"'{seq}' not found in sequence")
 
@@ -243,15 +367,17 @@ class SnapGene:
                 raise ValueError(f"{feature} has multiple segments, unclear how to set position from sequence.")
 
             for i in positions:
-                feat = deepcopy(feature)
+                feat = feature.clone()
                 if not segments:
                     feat.segment = FeatureSegment()
 
                 # Indexing starts at 1, per the spec.
                 feat.segment.range = (i + 1, i + len(seq))
-                feat.id = block.next_id
                 new_features.append(feat)
 
+        for id, feat in enumerate(new_features, block.next_id):
+            feat.id = id
+
         block.features += new_features
         return new_features
 
@@ -268,15 +394,13 @@ class SnapGene:
         except BlockNotFound:
             raise FeatureNotFound(f"no feature named '{name}'")
 
-        found_name = False
-        for feat in block.features[:]:
-            if feat.name == name:
-                block.features.remove(feat)
-                found_name = True
+        features = [x for x in block.features if x.name != name]
 
-        if not found_name:
+        if len(features) == len(block.features):
             raise FeatureNotFound(f"no feature named '{name}'")
 
+        block.features = features
+
         # Make the id numbers contiguous.  I don't think this is necessary, but 
         # it seems like the right thing to do.
 
@@ -325,7 +449,9 @@ class SnapGene:
         If a `pathlib.Path` is given as the name,  the stem of that path will 
         be taken as the name.
         """
-        return bool(self.get_traces(name))
+        if isinstance(name, Path):
+            name = name.stem
+        return any(x.name == name for x in self.get_traces())
 
     def add_trace(self, path, name=None):
         """
@@ -349,6 +475,15 @@ class SnapGene:
         """
         self.insert_trace(self.count_traces(), path, name=name)
 
+    def append_traces(self, paths, executor=None):
+        """
+        Add the given traces to this sequence after any existing traces.
+
+        This is equivalent to calling append_trace() for each path, but the 
+        trace metadata is only updated once.
+        """
+        self.insert_traces(self.count_traces(), paths, executor=executor)
+
     def prepend_trace(self, path, name=None):
         """
         Add the given trace to this sequence before any existing traces.
@@ -358,6 +493,14 @@ class SnapGene:
         """
         self.insert_trace(0, path, name=name)
 
+    def prepend_traces(self, paths, executor=None):
+        """
+        Add the given traces to this sequence before any existing traces.
+
+        The traces will appear in the order they're given.
+        """
+        self.insert_traces(0, paths, executor=executor)
+
     def insert_trace(self, i, path, name=None):
         """
         Add the given trace to this sequence at the given index.
@@ -365,36 +508,58 @@ class SnapGene:
         Unlike add_trace(), this function adds the trace unconditionally, which 
         may result in duplicates.
         """
-        path = Path(path)
+        self._insert_traces(i, [(path, name)])
 
-        # Convert the sequencing data to the ZTR format.
-        data = path.read_bytes()
-        ztr = parser.ztr_from_data(data)
+    def insert_traces(self, i, paths, executor=None):
+        """
+        Add the given traces to this sequence, starting at the given index.
+
+        The traces will appear in the order they're given, and each will be 
+        named after the stem of its path.
+
+        Each trace is converted by a separate `convert_trace` process.  If an 
+        *executor* (e.g. a `concurrent.futures.ThreadPoolExecutor`) is given, 
+        these conversions will be run concurrently.
+        """
+        self._insert_traces(i, [(path, None) for path in paths], executor)
+
+    def _insert_traces(self, i, paths_and_names, executor=None):
+        # Convert the sequencing data to the ZTR format.  Do this before 
+        # changing anything (including making the AlignmentsBlock), so a 
+        # failed conversion leaves the file exactly as it was.
+        paths = [Path(path) for path, _ in paths_and_names]
+        map_ = executor.map if executor else map
+        ztrs = list(map_(parser.ztr_from_file, paths))
 
-        # Figure out the next id from the AlignmentsBlock metadata.
         align_block = self.find_or_make_block(blocks.AlignmentsBlock)
-        next_id = max((x.id for x in align_block.metadata), default=0) + 1
-        next_order = max((x.sort_order for x in align_block.metadata), default=0) + 1
 
-        # Make a new AlignedTraceBlock with the ZTR data.
-        trace_block = blocks.AlignedTraceBlock()
-        trace_block.bytes = ztr
+        for j, (path, (_, name), ztr) in enumerate(
+                zip(paths, paths_and_names, ztrs)):
+
+            # Figure out the next id from the AlignmentsBlock metadata.
+            next_id = align_block.next_id
+
+            # Make a new AlignedTraceBlock with the ZTR data.
+            trace_block = blocks.AlignedTraceBlock()
+            trace_block.bytes = ztr
 
-        # Make a new AlignedSequenceBlock with the above id and trace block.
-        seq_block = blocks.AlignedSequenceBlock()
-        seq_block.id = next_id
-        seq_block.traces = [trace_block]
+            # Make a new AlignedSequenceBlock with the above id and trace 
+            # block.
+            seq_block = blocks.AlignedSequenceBlock()
+            seq_block.id = next_id
+            seq_block.traces = [trace_block]
 
-        # Add the sequence block to the file (the trace block will be added 
-        # indirectly via the sequence block).
-        self.blocks.append(seq_block)
+            # Add the sequence block to the file (the trace block will be 
+            # added indirectly via the sequence block).
+            self._append_block(seq_block)
 
-        # Update the AlignmentsBlock metadata.
-        meta = AlignmentMetadata()
-        meta.id = next_id
-        meta.name = name or path.stem
-        meta.is_trace = True
-        align_block.metadata.insert(i, meta)
+            # Update the AlignmentsBlock metadata.
+            meta = AlignmentMetadata()
+            meta.id = next_id
+            meta.name = name or path.stem
+            meta.is_trace = True
+            align_block.metadata.insert(i + j, meta)
+            align_block.next_id = next_id + 1
 
         self.sync_trace_metadata()
 
@@ -407,27 +572,39 @@ class SnapGene:
         all will be removed.  If there are no traces with the given name, a 
         ValueError will be raised.
         """
+        self.remove_traces([name])
 
-        if isinstance(name, Path):
-            name = name.stem
+    def remove_traces(self, names):
+        """
+        Remove the traces with any of the given names.
+
+        This is equivalent to calling remove_trace() for each name, but the 
+        blocks and metadata are only rebuilt once.  If any of the names don't 
+        match a trace, a ValueError will be raised and nothing will be removed.
+        """
+        names = {x.stem if isinstance(x, Path) else x for x in names}
 
-        # Remove the blocks/metadata corresponding to the given name.
+        # Remove the blocks/metadata corresponding to the given names.
 
         align_block = self.find_block(blocks.AlignmentsBlock)
-        seq_blocks = {
-                block.id: block
-                for block in self.find_blocks(blocks.AlignedSequenceBlock)
+        seq_blocks = self._find_seq_blocks_by_id()
+
+        removed_blocks = {
+                id(seq_blocks[meta.id])
+                for meta in align_block.metadata
+                if meta.name in names
         }
+        missing_names = names - {x.name for x in align_block.metadata}
 
-        found_name = False
-        for meta in align_block.metadata[:]:
-            if meta.name == name:
-                align_block.metadata.remove(meta)
-                self.blocks.remove(seq_blocks[meta.id])
-                found_name = True
+        if missing_names:
+            missing_str = "', '".join(sorted(missing_names))
+            raise ValueError(f"no trace named '{missing_str}'")
 
-        if not found_name:
-            raise ValueError(f"no trace named '{name}'")
+        align_block.metadata = [
+                x for x in align_block.metadata
+                if x.name not in names
+        ]
+        self._remove_blocks_by_id(removed_blocks)
 
         # Make the id numbers contiguous.  I don't think this is necessary, but 
         # it seems like the right thing to do.
@@ -436,6 +613,8 @@ class SnapGene:
             old_id = meta.id
             meta.id = seq_blocks[old_id].id = new_id
 
+        self._seq_blocks_by_id = None
+
         self.sync_trace_metadata()
 
     def rename_trace(self, old_name, new_name):
@@ -444,9 +623,9 @@ class SnapGene:
 
         If multiple traces have the same name, they will all be renamed.
         """
-        traces = self.get_trace(old_name)
+        traces = self.get_traces(old_name)
         if not traces:
-            raise ValueError("no trace named '{old_name}'")
+            raise ValueError(f"no trace named '{old_name}'")
 
         for meta in traces:
             meta.name = new_name
@@ -481,19 +660,18 @@ class SnapGene:
         # because I thought they might be causing problems, but further 
         # experimentation made that seem like the wrong hypothesis.  I'm 
         # keeping the code, though, because it doesn't seem like it could hurt.  
-        existing_ids = set()
-        for block in self.find_blocks(blocks.AlignedSequenceBlock):
-            existing_ids.add(block.id)
+        #
+        # At the same time, make sure the sort order matches the actual list 
+        # order.
+        existing_ids = self._find_seq_blocks_by_id()
+        metadata = []
 
-        align_block.metadata = [
-                meta
-                for meta in align_block.metadata
-                if meta.id in existing_ids
-        ]
+        for meta in align_block.metadata:
+            if meta.id in existing_ids:
+                meta.sort_order = len(metadata)
+                metadata.append(meta)
 
-        # Make sure the sort order matches the actual list order.
-        for i, meta in enumerate(align_block.metadata):
-            meta.sort_order = i
+        align_block.metadata = metadata
 
     def pick_trace(self, name):
         """
@@ -504,7 +682,6 @@ class SnapGene:
 
         for trace in self.traces:
             trace.is_visible = (trace.name == name)
-            debug(trace)
 
     def count_traces(self):
         """
@@ -531,21 +708,21 @@ class SnapGene:
         self.remove_block(blocks.AlignmentsBlock)
         self.remove_blocks(blocks.AlignedSequenceBlock)
 
-    def extract_traces(self, dir):
+    def extract_traces(self, dir, executor=None):
         """
         Save any traces associated with this sequence as separate files in the 
         given directory.
 
         The traces will be saved in the ZTR format, which is the format used 
-        internally by SnapGene.
+        internally by SnapGene.  The files are independent of each other, so 
+        if an *executor* (e.g. a `concurrent.futures.ThreadPoolExecutor`) is 
+        given, it will be used to write them concurrently.
         """
         dir = Path(dir)
         dir.mkdir(parents=True, exist_ok=True)
 
-        seq_blocks = {
-                block.id: block
-                for block in self.find_blocks(blocks.AlignedSequenceBlock)
-        }
+        seq_blocks = self._find_seq_blocks_by_id()
+        paths, datas = [], []
 
         for meta in self.get_traces():
             seq_block = seq_blocks[meta.id]
@@ -553,8 +730,11 @@ class SnapGene:
 
             for i, trace_block in enumerate(trace_blocks):
                 suffix = f'_{i+1}' if len(trace_blocks) > 1 else ''
-                path = dir / f'{meta.name}{suffix}.ztr'
-                path.write_bytes(trace_block.bytes)
+                paths.append(dir / f'{meta.name}{suffix}.ztr')
+                datas.append(trace_block.bytes)
+
+        map_ = executor.map if executor else map
+        list(map_(Path.write_bytes, paths, datas))
 
     # Primers
 
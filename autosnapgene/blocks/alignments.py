@@ -3,12 +3,21 @@
 from ..parser import Block, Xml, Repr, UnparsedBlock
 from ..parser import blocks_from_bytes, bytes_from_blocks
 
+import autoprop
 import struct
 
+_ID = struct.Struct('>I')
+
+@autoprop
 class AlignmentsBlock(Xml, Block):
     block_id = 17
     repr_attrs = ['metadata']
 
+    # The next id is cached, so that adding many traces doesn't require 
+    # scanning all the metadata each time.  None means "not yet calculated".  
+    # The cache is dropped whenever the metadata list is replaced.
+    _next_id = None
+
     class MetadataTag(Xml.AppendListTag):
 
         @staticmethod
@@ -22,6 +31,7 @@ class AlignmentsBlock(Xml, Block):
                 parent.append(e)
 
     xml_tag = 'AlignableSequences'
+    xml_stream = True
     xml_subtag_defs = [
             ('metadata', 'Sequence', MetadataTag, []),
     ]
@@ -36,17 +46,54 @@ class AlignmentsBlock(Xml, Block):
         else:
             return super().__repr_attr__(attr)
 
+    def get_metadata(self):
+        return self._metadata
+
+    def set_metadata(self, metadata):
+        self._metadata = metadata
+        self._next_id = None
+
+    def get_next_id(self):
+        """
+        The id to give the next trace added to this block.
+
+        The id is cached, and the cache is only dropped when a new list is 
+        assigned to `metadata`.  Adding entries in place (e.g. with 
+        `metadata.append()` or `metadata.insert()`) doesn't update it, so 
+        either set `next_id` explicitly afterwards, or assign a new list.
+        """
+        if self._next_id is None:
+            self._next_id = max((x.id for x in self.metadata), default=0) + 1
+        return self._next_id
+
+    def set_next_id(self, value):
+        self._next_id = value
+
 class AlignmentMetadata(Xml, Repr):
 
     class TrimmedRangeAttrib:
 
         @staticmethod
         def from_str(str):
-            return tuple(int(x) for x in str.split('..'))
+            i, _, j = str.partition('..')
+            return int(i), int(j)
 
         @staticmethod
         def to_str(value):
-            return '..'.join(str(x) for x in value)
+            i, j = value
+            return f'{i}..{j}'
+
+    # There can be thousands of these in a single file, so don't give each one 
+    # a `__dict__`.
+    __slots__ = (
+            'id',
+            'name',
+            'is_visible',
+            'is_trace',
+            'sort_order',
+            'trimmed_range',
+            'is_manually_trimmed',
+    )
 
     xml_tag = 'Sequence'
     xml_attrib_defs = [
@@ -73,14 +120,12 @@ class AlignedSequenceBlock(Block):
     @classmethod
     def from_bytes(cls, bytes):
         block = cls()
-        block.id, = struct.unpack('>I', bytes[:4])
-        block.traces = blocks_from_bytes(bytes[4:])
+        block.id, = _ID.unpack_from(bytes)
+        block.traces = blocks_from_bytes(memoryview(bytes)[4:])
         return block
 
     def to_bytes(self):
-        bytes = struct.pack('>I', self.id)
-        bytes += bytes_from_blocks(self.traces)
-        return bytes
+        return _ID.pack(self.id) + bytes_from_blocks(self.traces)
 
 class AlignedTraceBlock(UnparsedBlock):
     block_id = 18
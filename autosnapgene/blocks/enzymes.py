@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 
 from ..parser import UndocumentedBlock
+import autoprop
 import struct
 
+_SITES_HEADER = struct.Struct('>BI')
+
+@autoprop
 class RestrictionDigestBlock(UndocumentedBlock):
     block_id = 3
     repr_attrs = ['sites']
@@ -58,6 +62,19 @@ class RestrictionDigestBlock(UndocumentedBlock):
         self.sites = []
         self.unk_2 = b''
 
+    def get_sites(self):
+        # Nothing in this package looks at the sites, so keep the raw bytes and 
+        # only split/decode them if someone asks.  Once the list has been 
+        # handed out it might be modified, so forget the raw bytes then.
+        if self._sites is None:
+            self._sites = self._sites_bytes.decode('ascii').split(',')
+            self._sites_bytes = None
+        return self._sites
+
+    def set_sites(self, sites):
+        self._sites = sites
+        self._sites_bytes = None
+
     def __repr_attr__(self, attr):
         if attr == 'sites':
             return str(len(self.sites))
@@ -68,22 +85,24 @@ class RestrictionDigestBlock(UndocumentedBlock):
     def from_bytes(cls, bytes):
         block = super().from_bytes(bytes)
 
-        _, n = struct.unpack('>BI', bytes[0:5])
+        _, n = _SITES_HEADER.unpack_from(bytes)
 
         block.unk_1 = _
-        block.sites = bytes[5:5+n].decode('ascii').split(',')
+        block._sites = None
+        block._sites_bytes = bytes[5:5+n]
         block.unk_2 = bytes[5+n:]
 
         return block
 
     def to_bytes(self):
-        sites_bytes = b','.join(x.encode('ascii') for x in self.sites)
-
-        bytes = b''
-        bytes += struct.pack('>BI', self.unk_1, len(sites_bytes))
-        bytes += sites_bytes
-        bytes += self.unk_2
+        sites_bytes = self._sites_bytes
+        if sites_bytes is None:
+            sites_bytes = b','.join(x.encode('ascii') for x in self.sites)
 
-        return bytes
+        return b''.join([
+                _SITES_HEADER.pack(self.unk_1, len(sites_bytes)),
+                sites_bytes,
+                self.unk_2,
+        ])
 
 
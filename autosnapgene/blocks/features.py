@@ -3,9 +3,11 @@
 from ..parser import Block, Xml, Repr
 from ..util import reverse_complement
 
+import sys
 import autoprop
 import xml.etree.ElementTree as etree
-from more_itertools import one, always_iterable
+from copy import copy
+from more_itertools import always_iterable
 
 @autoprop
 class FeaturesBlock(Xml, Block):
@@ -28,6 +30,7 @@ class FeaturesBlock(Xml, Block):
                 parent.append(e)
 
     xml_tag = 'Features'
+    xml_stream = True
     xml_subtag_defs = [
             ('features', 'Feature', FeatureTag, []),
     ]
@@ -62,6 +65,30 @@ class FeaturesBlock(Xml, Block):
 class Feature(Xml, Repr):
     repr_attrs = 'name', 'type'
 
+    # Files can have thousands of features, so don't give each one a 
+    # `__dict__`.  There must be a slot for each XML attribute and subtag.
+    __slots__ = (
+            'segments',
+            'qualifiers',
+            'id',
+            'name',
+            'type',
+            'directionality',
+            'reading_frame',
+            'cleavage_arrows',
+            'allow_segment_overlaps',
+            'swapped_segment_numbering',
+            'max_run_on',
+            'max_fused_run_on',
+            'detection_mode',
+            'genetic_code_id',
+            'first_codon_met',
+            'consecutive_translation_numbering',
+            'consecutive_numbering_start',
+            'translated_mw',
+            'hits_stop_codon',
+    )
+
     class SegmentTag(Xml.AppendListTag):
 
         @staticmethod
@@ -83,7 +110,9 @@ class Feature(Xml, Repr):
 
         @classmethod
         def from_xml(cls, element):
-            name = element.attrib['name']
+            # The same few qualifier names appear in almost every feature.
+            name = sys.intern(element.attrib['name'])
+            data_types = cls.data_types
 
             def get_value(sub):
                 # This isn't in the spec, but I assume I'll never get multiple 
@@ -102,12 +131,16 @@ class Feature(Xml, Repr):
                 assert len(sub.attrib) == 1, etree.tostring(element)
 
                 key, value = sub.attrib.popitem()
-                return cls.data_types.get(key, str)(value)
+                return data_types.get(key, str)(value)
 
+            # Most qualifiers have a single value, so handle that case without 
+            # building a list.  Otherwise, iterate over the children directly 
+            # rather than using `findall()`, which goes through the (pure 
+            # python) path machinery.
             if len(element) == 1:
-                value = get_value(element.find('V'))
+                value = get_value(element[0])
             else:
-                value = [get_value(x) for x in element.findall('V')]
+                value = [get_value(x) for x in element if x.tag == 'V']
 
             return {name: value}
 
@@ -139,11 +172,11 @@ class Feature(Xml, Repr):
 
         @staticmethod
         def from_str(str):
-            return [int(x) for x in str.split(',')]
+            return list(map(int, str.split(',')))
 
         @staticmethod
         def to_str(value):
-            return ','.join(str(x) for x in value)
+            return ','.join(map(str, value))
 
     xml_tag = 'Feature'
     xml_subtag_defs = [
@@ -153,7 +186,7 @@ class Feature(Xml, Repr):
     xml_attrib_defs = [
             ('id', 'recentID', Xml.IntAttrib),
             ('name', 'name', Xml.TextAttrib),
-            ('type', 'type', Xml.TextAttrib),
+            ('type', 'type', Xml.InternedTextAttrib),
             ('directionality', 'directionality', DirectionalityAttrib),
             ('reading_frame', 'readingFrame', Xml.IntAttrib),
             ('cleavage_arrows', 'cleavageArrows', CleavageArrowsAttrib),
@@ -180,27 +213,37 @@ class Feature(Xml, Repr):
         Keyword arguments corresponding to any attribute of either the Feature 
         or FeatureSegment classes are accepted.
         """
-        feature_kwargs = {
-                k: v
-                for k, v in kwargs.items() 
-                if k in cls._defined_names
-        }
-        segment_kwargs = {
-                k: v
-                for k, v in kwargs.items() 
-                if k not in cls._defined_names
-        }
+        feature_kwargs = {}
+        segment_kwargs = {}
+
+        for k, v in kwargs.items():
+            if k in cls._defined_name_set:
+                feature_kwargs[k] = v
+            else:
+                segment_kwargs[k] = v
 
         feature = cls(**feature_kwargs)
         feature.segments = [FeatureSegment(**segment_kwargs)]
         return feature
 
+    def clone(self):
+        clone = super().clone()
+        if hasattr(self, 'segments'):
+            clone.segments = [x.clone() for x in self.segments]
+        if hasattr(self, 'qualifiers'):
+            # Qualifiers with multiple values are stored as lists.
+            clone.qualifiers = {k: copy(v) for k, v in self.qualifiers.items()}
+        return clone
+
     def get_segment(self):
         """
         If this feature has only one segment, return it.  Otherwise, raise an 
         exception.
         """
-        return one(self.segments)
+        segments = self.segments
+        if len(segments) != 1:
+            raise ValueError(f"expected 1 segment, got {len(segments)}")
+        return segments[0]
 
     def set_segment(self, segment):
         """
@@ -238,6 +281,14 @@ class Feature(Xml, Repr):
 @autoprop
 class FeatureSegment(Xml, Repr):
     repr_attrs = 'type', 'color', 'range'
+    __slots__ = (
+            'name',
+            'range',
+            'display',
+            'color',
+            'is_translated',
+            'translation_start_number',
+    )
 
     class RangeAttrib:
 
@@ -245,8 +296,8 @@ class FeatureSegment(Xml, Repr):
         def from_str(str):
             # Make the range indices compatible with the conventions for python 
             # slicing.
-            i, j = tuple(int(x) for x in str.split('-'))
-            return i - 1, j
+            i, _, j = str.partition('-')
+            return int(i) - 1, int(j)
 
         @staticmethod
         def to_str(value):
@@ -257,8 +308,8 @@ class FeatureSegment(Xml, Repr):
     xml_attrib_defs = [
             ('name', 'name', Xml.TextAttrib),
             ('range', 'range', RangeAttrib),
-            ('display', 'type', Xml.TextAttrib),
-            ('color', 'color', Xml.TextAttrib),
+            ('display', 'type', Xml.InternedTextAttrib),
+            ('color', 'color', Xml.InternedTextAttrib),
             ('is_translated', 'translated', Xml.BoolAttrib),
             ('translation_start_number', 'translationNumberingStartsFrom', Xml.IntAttrib),
     ]
@@ -6,10 +6,13 @@ from ..errors import *
 import autoprop
 import struct
 
+_INFO = struct.Struct('>HHH')
+
 @autoprop
 class HeaderBlock(Block):
     block_id = 9
     repr_attrs = 'type', 'export_version', 'import_version'
+    defer_parsing = False
 
     file_types = {
             0: 'unknown',
@@ -29,7 +32,7 @@ class HeaderBlock(Block):
         if magic_cookie != "SnapGene":
             raise ParseError("not a snapgene file")
 
-        info = struct.unpack('>HHH', bytes[8:14])
+        info = _INFO.unpack_from(bytes, 8)
         return cls.from_info(*info)
 
     @classmethod
@@ -41,7 +44,7 @@ class HeaderBlock(Block):
         return block
 
     def to_bytes(self):
-        return b'SnapGene' + struct.pack('>HHH',
+        return b'SnapGene' + _INFO.pack(
                 self.type_id, self.export_version, self.import_version)
 
     def get_type(self):
@@ -43,6 +43,12 @@ class NotesBlock(Xml, Block):
 
 class Reference(Xml, Repr):
     repr_attrs = 'pubmed_id',
+    __slots__ = (
+            'title',
+            'pubmed_id',
+            'journal',
+            'authors',
+    )
     xml_tag = 'Reference'
     xml_attrib_defs = [
             ('title', 'title', Xml.TextAttrib),
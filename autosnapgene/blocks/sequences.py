@@ -1,9 +1,55 @@
 #!/usr/bin/env python3
 
 from ..parser import Block
+import autoprop
 import struct
 
-class DnaBlock(Block):
+_PROPS = struct.Struct('>B')
+
+@autoprop
+class SequenceBlock(Block):
+    # Base class for blocks that store a DNA or protein sequence.
+
+    def get_sequence(self):
+        # Blocks read from a file keep the raw ASCII bytes, and only decode 
+        # them if the sequence is actually needed.
+        if self._sequence is None and self._sequence_bytes is not None:
+            self._sequence = self._sequence_bytes.decode('ascii')
+        return self._sequence
+
+    def set_sequence(self, value):
+        self._sequence = value
+        self._sequence_bytes = None
+        self._upper_sequence = None
+
+    def get_sequence_bytes(self):
+        """
+        The sequence, as ASCII-encoded bytes.
+
+        This avoids decoding the sequence when working on it as bytes (e.g. 
+        with `bytes.upper()` or `bytes.translate()`) is good enough.
+        """
+        if self._sequence_bytes is None:
+            self._sequence_bytes = self._sequence.encode('ascii')
+        return self._sequence_bytes
+
+    def set_sequence_bytes(self, bytes):
+        self._sequence = None
+        self._sequence_bytes = bytes
+        self._upper_sequence = None
+
+    def get_upper_sequence(self):
+        """
+        The sequence, converted to upper case.
+
+        This is cached, so searching for several subsequences doesn't require 
+        making a new copy of the whole sequence each time.
+        """
+        if self._upper_sequence is None:
+            self._upper_sequence = self.sequence.upper()
+        return self._upper_sequence
+
+class DnaBlock(SequenceBlock):
     block_id = 0
     repr_attrs = 'sequence',
 
@@ -36,21 +82,21 @@ class DnaBlock(Block):
         block.is_dcm_methylated = bool(props & 0x08)
         block.is_ecoki_methylated = bool(props & 0x10)
 
-        block.sequence = bytes[1:].decode('ascii')
+        block.sequence_bytes = bytes[1:]
 
         return block
 
     def to_bytes(self):
-        props = sum([
-                0x01 if self.topology == 'circular' else 0x00,
-                0x02 if self.strandedness == 'double' else 0x00,
-                0x04 * self.is_dam_methylated,
-                0x08 * self.is_dcm_methylated,
-                0x10 * self.is_ecoki_methylated,
-        ])
-        return struct.pack('>B', props) + self.sequence.encode('ascii')
-
-class ProteinBlock(Block):
+        props = (
+                (0x01 if self.topology == 'circular' else 0x00) |
+                (0x02 if self.strandedness == 'double' else 0x00) |
+                (0x04 if self.is_dam_methylated else 0x00) |
+                (0x08 if self.is_dcm_methylated else 0x00) |
+                (0x10 if self.is_ecoki_methylated else 0x00)
+        )
+        return _PROPS.pack(props) + self.sequence_bytes
+
+class ProteinBlock(SequenceBlock):
     block_id = 21
     repr_attrs = 'sequence',
 
@@ -80,11 +126,11 @@ class ProteinBlock(Block):
         # properties of the DNA, but those same properties wouldn't apply to 
         # proteins.
         block.props = bytes[0]
-        block.sequence = bytes[1:].decode('ascii')
+        block.sequence_bytes = bytes[1:]
 
         return block
 
     def to_bytes(self):
-        return struct.pack('>B', self.props or 0) \
-                + self.sequence.encode('ascii')
+        return _PROPS.pack(self.props or 0) \
+                + self.sequence_bytes
 
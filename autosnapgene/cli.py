@@ -1,12 +1,8 @@
 #!/usr/bin/env python3
 
-from . import api
-
-from docopt import docopt
-from pathlib import Path
-from nonstdlib import indices_from_str
-import sys, os
+import sys
 import textwrap
+from operator import attrgetter
 
 commands = {}
 
@@ -15,12 +11,13 @@ def command(f):
     return f
 
 def parse_cli(main=None, argv=None, **kwargs):
-    import inspect
+    from docopt import docopt
     from textwrap import dedent
 
+    # Don't use `inspect.stack()` here; it reads the source code for every 
+    # frame on the stack, which is slow.
     if main is None:
-        frame = inspect.stack()[1]
-        main = globals()[frame.function]
+        main = globals()[sys._getframe(1).f_code.co_name]
 
     doc = dedent(main.__doc__.format(**kwargs))
     return docopt(doc, argv=argv)
@@ -46,6 +43,19 @@ def format_command_descriptions():
 
     return doc.strip()
 
+def pretty_xml(bytes):
+    import xml.etree.ElementTree as etree
+
+    # `indent()` was added in python 3.9.  Before that, fall back on minidom, 
+    # which builds a much heavier tree and is slow for big blocks.
+    if not hasattr(etree, 'indent'):
+        from xml.dom import minidom
+        return minidom.parseString(bytes).toprettyxml().encode('utf8')
+
+    root = etree.fromstring(bytes)
+    etree.indent(root)
+    return etree.tostring(root, encoding='unicode').encode('utf8') + b'\n'
+
 
 def main():
     """\
@@ -63,7 +73,10 @@ def main():
         if len(sys.argv) > 1 and sys.argv[1] in commands:
             return commands[sys.argv[1]]()
         else:
-            parse_cli(argv=['-h'], commands=format_command_descriptions())
+            # This is just what docopt would print for '-h', but without 
+            # having to build a parser for the usage text first.
+            doc = main.__doc__.format(commands=format_command_descriptions())
+            print(textwrap.dedent(doc).strip('\n'))
 
     except FileNotFoundError as err:
         sys.exit(err)
@@ -85,6 +98,8 @@ def seq():
             Save the modified file to the given path, and leave the input file 
             unmodified.  The default is to overwrite the input file.
     """
+    from . import api
+
     args = parse_cli()
     dna = api.parse(args['<dna_path>'])
 
@@ -98,12 +113,14 @@ def seq():
         dna.sequence = args['<seq>']
         dna.write(args['--out'])
 
+    # The sequence is ASCII, so there's no need to decode it just to change 
+    # the case.
     if args['upper']:
-        dna.sequence = dna.sequence.upper()
+        dna.sequence_bytes = dna.sequence_bytes.upper()
         dna.write(args['--out'])
 
     if args['lower']:
-        dna.sequence = dna.sequence.lower()
+        dna.sequence_bytes = dna.sequence_bytes.lower()
         dna.write(args['--out'])
 
 @command
@@ -139,6 +156,8 @@ def feature():
         -T --translate
             Indicate that the feature being added should be translated.
     """
+    from . import api
+
     args = parse_cli()
     dna = api.parse(args['<dna_path>'])
 
@@ -161,8 +180,14 @@ def feature():
         dna.write(args['--out'])
 
     if args['remove']:
-        try: dna.remove_feature(args['<name>'])
-        except api.FeatureNotFound: pass
+        try:
+            dna.remove_feature(args['<name>'])
+        except api.FeatureNotFound:
+            # Nothing changed, so don't rewrite the input file.  If a separate 
+            # output file was requested, though, it still needs to be written.
+            if not args['--out']:
+                return
+
         dna.write(args['--out'])
 
     if args['clear']:
@@ -190,6 +215,8 @@ def trace():
             Save the modified file to the given path, and leave the input file 
             unmodified.  The default is to overwrite the input file.
     """
+    from . import api
+
     args = parse_cli()
     dna = api.parse(args['<dna_path>'])
 
@@ -198,24 +225,43 @@ def trace():
         dna.write(args['--out'])
 
     def apply_ab1_and_save(method):
+        from pathlib import Path
+
         for ab1 in args['<ab1_paths>']:
             method(Path(ab1))
         dna.write(args['--out'])
 
+    def apply_ab1s_and_save(method, reverse=False):
+        from pathlib import Path
+        from concurrent.futures import ThreadPoolExecutor
+
+        paths = [Path(x) for x in args['<ab1_paths>']]
+        if reverse:
+            paths.reverse()
+
+        # The conversions happen in separate processes, so threads are enough 
+        # to run them concurrently.
+        with ThreadPoolExecutor() as executor:
+            method(paths, executor=executor)
+
+        dna.write(args['--out'])
+
     def apply_name_and_save(method):
         for name in args['<trace_name>']:
             method(name)
         dna.write(args['--out'])
 
     if args['list']:
-        for trace in sorted(dna.traces, key=lambda x: (x.sort_order, x.name)):
-            print(trace.name)
+        traces = sorted(dna.traces, key=attrgetter('sort_order', 'name'))
+        sys.stdout.write(''.join(f'{x.name}\n' for x in traces))
     if args['add']:
         apply_ab1_and_save(dna.add_trace)
     if args['append']:
-        apply_ab1_and_save(dna.append_trace)
+        apply_ab1s_and_save(dna.append_traces)
     if args['prepend']:
-        apply_ab1_and_save(dna.prepend_trace)
+        # Each trace is prepended in turn, so the last one given ends up 
+        # first.
+        apply_ab1s_and_save(dna.prepend_traces, reverse=True)
     if args['remove']:
         apply_name_and_save(dna.remove_trace)
     if args['pick']:
@@ -225,7 +271,10 @@ def trace():
     if args['clear']:
         apply_and_save(dna.clear_traces)
     if args['extract']:
-        dna.extract_traces(args['<out_dir>'])
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor() as executor:
+            dna.extract_traces(args['<out_dir>'], executor=executor)
 
 @command
 def history():
@@ -240,6 +289,8 @@ def history():
             Save the modified file to the given path, and leave the input file 
             unmodified.  The default is to overwrite the input file.
     """
+    from . import api
+
     args = parse_cli()
     dna = api.parse(args['<dna_path>'])
 
@@ -281,37 +332,68 @@ def debug():
             XML data.
 
     """
+    from . import api
+
     args = parse_cli()
     dna = api.parse(args['<dna_path>'])
 
+    def parse_indices(spec):
+        if not spec:
+            return None
+
+        from nonstdlib import indices_from_str
+        return frozenset(indices_from_str(spec))
+
+    # Parse the id/index specifications once, not once per block.
+    ids = parse_indices(args['--id'])
+    indices = parse_indices(args['--index'])
+
     def is_specified(i, block):
-        if args['--id']:
-            return block.block_id in indices_from_str(args['--id'])
-        if args['--index']:
-            return i in indices_from_str(args['--index'])
+        if ids is not None:
+            return block.block_id in ids
+        if indices is not None:
+            return i in indices
         return True
 
     if args['parse']:
+        # Accessing the blocks forces all of them to be parsed, so the output 
+        # reflects what we understood rather than just the raw input.
+        _ = dna.blocks
         dna.write(args['--out'])
 
     if args['list-blocks']:
-        for i, block in enumerate(dna.blocks):
-            if is_specified(i, block):
-                print(f"{i}: {block}")
+        sys.stdout.write(''.join(
+                f"{i}: {block}\n"
+                for i, block in enumerate(dna.blocks)
+                if is_specified(i, block)
+        ))
 
     if args['dump-blocks']:
+        # Collect everything and write it all at once, rather than making a 
+        # separate write for every block.
+        dumps = []
+
         for i, block in enumerate(dna.blocks):
-            if is_specified(i, block):
-                if args['--bytes']:
-                    fp = os.fdopen(sys.stdout.fileno(), 'wb')
-                    fp.write(block.bytes)
-                if args['--xml']:
-                    from xml.dom import minidom 
-                    xml = minidom.parseString(block.bytes.decode('utf8'))
-                    print(xml.toprettyxml())
-                else:
-                    print(block.bytes)
-                    print()
+            if not is_specified(i, block):
+                continue
+
+            if args['--bytes']:
+                dumps.append(block.bytes)
+            elif args['--xml']:
+                dumps.append(pretty_xml(block.bytes) + b'\n')
+            else:
+                dumps.append(f'{block.bytes}\n\n'.encode('utf8'))
+
+        # Not every text stream has an underlying binary buffer (e.g. if 
+        # stdout has been replaced by a `StringIO`).
+        dump = b''.join(dumps)
+        buffer = getattr(sys.stdout, 'buffer', None)
+
+        if buffer is not None:
+            sys.stdout.flush()
+            buffer.write(dump)
+        else:
+            sys.stdout.write(dump.decode('utf8', 'surrogateescape'))
 
     if args['remove-blocks']:
         dna.blocks = [
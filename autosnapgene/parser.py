@@ -1,65 +1,153 @@
 #!/usr/bin/env python3
 
+import os
+import sys
 import struct
 import arrow
 import xml.etree.ElementTree as etree
 
+from io import BytesIO
 from pathlib import Path
-from copy import deepcopy
+from itertools import repeat
+from inspect import signature
+from copy import copy, deepcopy
+from contextlib import contextmanager
 from .errors import *
 
-def blocks_from_file(path, block_classes=None):
+# Files bigger than this are memory-mapped rather than read into memory.
+MMAP_THRESHOLD = 1 << 20
+
+# The id and size that precede the contents of every block.
+BLOCK_HEADER = struct.Struct('>BI')
+
+# Stands in for attributes that haven't been set.
+_undef = object()
+
+def _getattr_or_undef(obj, name):
+    # Bypass `Xml.__getattr__()`, which would otherwise be called (and would 
+    # format an error message) for every attribute that isn't set.
     try:
-        bytes = Path(path).read_bytes()
-        return blocks_from_bytes(bytes)
+        return object.__getattribute__(obj, name)
+    except AttributeError:
+        return _undef
+
+# Default values of these types can be shared between objects.
+_immutable_types = type(None), bool, int, float, str, bytes
+
+# Build this once, not every time a boolean is parsed.  Anything other than 
+# '0' or '1' is still an error.
+_bool_from_str = {'0': False, '1': True}
+
+# Most XML objects don't have any unparsed attributes or subtags, so they all 
+# share these placeholders until they do.  Never modify them in place.
+_no_unparsed_attribs = {}
+_no_unparsed_subtags = ()
+
+@contextmanager
+def _read_or_map(path):
+    # Yield the contents of the given file.  Small files are simply read into 
+    # memory, but anything bigger than `MMAP_THRESHOLD` is memory-mapped 
+    # (read-only) instead.
+    import mmap
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= MMAP_THRESHOLD:
+            yield f.read()
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+def blocks_from_file(path, block_classes=None, lazy=False, executor=None):
+    try:
+        # Big files are mapped rather than read, so the only copy of each 
+        # block is the one made while splitting the file into blocks.
+        with _read_or_map(path) as data:
+            return blocks_from_bytes(data, block_classes, lazy, executor)
 
     except ParseError as e:
         e.path = path
         raise e from None
 
-def blocks_from_bytes(bytes, block_classes=None):
+def blocks_from_bytes(bytes, block_classes=None, lazy=False, executor=None):
+    """
+    Split the given bytes into blocks.
+
+    If *lazy* is true, blocks that are expensive to parse are returned as 
+    `DeferredBlock` placeholders, which can be parsed later if necessary.
+
+    The blocks are independent of each other, so if an *executor* (e.g. a 
+    `concurrent.futures.ProcessPoolExecutor`) is given, it will be used to 
+    parse them in parallel.  Otherwise they are parsed one after another.
+
+    Any buffer (e.g. a `memoryview` or an `mmap`) can be given in place of 
+    bytes.  The contents of each block are copied out exactly once.
+    """
     i = 0
-    blocks = []
+    ids, classes, contents = [], [], []
 
     if block_classes is None:
         # Make sure all of the subclasses have been loaded.
         from . import blocks as _
         block_classes = Block.block_classes
 
-    while i < len(bytes):
-        j = i + 5
-        if len(bytes) < j:
-            raise ParseError("unexpected EOF")
+    # Release the view explicitly (even if there's an error), otherwise an 
+    # `mmap` can't be closed until the view is garbage collected.
+    with memoryview(bytes) as view:
+        while i < len(view):
+            j = i + BLOCK_HEADER.size
+            if len(view) < j:
+                raise ParseError("unexpected EOF")
+
+            id, size = BLOCK_HEADER.unpack_from(view, i)
+            if len(view) < j + size:
+                raise ParseError("unexpected EOF")
+
+            ids.append(id)
+            classes.append(block_classes.get(id, UndocumentedBlock))
+            contents.append(view[j:j+size].tobytes())
+            i = j + size
 
-        id, size = struct.unpack('>BI', bytes[i:j])
-        if len(bytes) < j + size:
-            raise ParseError("unexpected EOF")
+    map_ = executor.map if executor else map
+    return list(map_(block_from_bytes, classes, ids, contents, repeat(lazy)))
 
-        content = bytes[j:j+size]
-        cls = block_classes.get(id, UndocumentedBlock)
-        block = cls.from_bytes(content)
-        block.block_id = id
-        block.bytes = content
-        blocks.append(block)
-        i = j + size
+def block_from_bytes(cls, id, bytes, lazy=False):
+    if lazy and cls.defer_parsing:
+        block = DeferredBlock(cls)
+    else:
+        block = cls.from_bytes(bytes)
 
-    return blocks
+    block.block_id = id
+    block.bytes = bytes
+    return block
 
 def file_from_blocks(path, blocks):
     bytes = bytes_from_blocks(blocks)
     Path(path).write_bytes(bytes)
 
 def bytes_from_blocks(blocks):
-    bytes = b''
+    # Join the headers and contents all at once, rather than concatenating 
+    # each header to its contents first, so the contents are only copied once.
+    pieces = []
+
     for block in blocks:
-        bytes += bytes_from_block(block)
-    return bytes
+        bytes = block.to_bytes()
+        pieces.append(BLOCK_HEADER.pack(block.block_id, len(bytes)))
+        pieces.append(bytes)
+
+    return b''.join(pieces)
 
 def bytes_from_block(block):
     bytes = block.to_bytes()
-    header = struct.pack('>BI', block.block_id, len(bytes))
+    header = BLOCK_HEADER.pack(block.block_id, len(bytes))
     return header + bytes
 
+def ztr_from_file(path):
+    # Large traces are mapped so that they can be piped to the converter 
+    # without making a copy.
+    with _read_or_map(path) as data:
+        return ztr_from_data(data)
+
 def ztr_from_data(data):
     from subprocess import run, PIPE
 
@@ -88,19 +176,30 @@ def ztr_from_data(data):
     return p.stdout
 
 class Repr:
+    __slots__ = ()
 
     def __repr__(self):
-        return f"<{self.__class__.__name__} {self.__repr_attrs__()}".strip() + ">"
+        attrs = self.__repr_attrs__()
+        if attrs:
+            return f"<{self.__class__.__name__} {attrs}>"
+        else:
+            return f"<{self.__class__.__name__}>"
 
     def __repr_attrs__(self):
         if not self.repr_attrs:
             raise NotImplementedError
 
-        return ' '.join(
-                f'{k}="{self.__repr_attr__(k)}"'
-                for k in self.repr_attrs
-                if hasattr(self, k)
-        )
+        # Just try to get each attribute, rather than checking for it with 
+        # `hasattr()` and then getting it again.
+        attrs = []
+
+        for k in self.repr_attrs:
+            try:
+                attrs.append(f'{k}="{self.__repr_attr__(k)}"')
+            except AttributeError:
+                pass
+
+        return ' '.join(attrs)
 
     def __repr_attr__(self, attr):
         return getattr(self, attr)
@@ -110,10 +209,17 @@ class Xml:
     """
     A class that can read/write its attributes to/from XML.
     """
+    __slots__ = ('_unparsed_attribs', '_unparsed_subtags')
+
     xml_tag = None
     xml_subtag_defs = []
     xml_attrib_defs = []
 
+    # If true, `from_bytes()` parses the XML incrementally and discards each 
+    # subtag once it's been parsed.  This bounds the memory needed for tags 
+    # with many children, but is a bit slower for small documents.
+    xml_stream = False
+
     class TextTag:
 
         @staticmethod
@@ -128,21 +234,24 @@ class Xml:
 
         @staticmethod
         def from_xml(element):
-            return {'0': False, '1': True}[element.text]
+            return _bool_from_str[element.text]
 
         @staticmethod
         def to_xml(element, value):
-            element.text = str(int(value))
+            element.text = '1' if value else '0'
 
     class DateTag:
 
         @staticmethod
         def from_xml(element):
-            return arrow.get(element.text, 'YYYY.M.D')
+            # The format is simple enough that arrow's (slow, general-purpose) 
+            # format parser isn't needed, i.e. 'YYYY.M.D'.
+            y, m, d = element.text.split('.')
+            return arrow.Arrow(int(y), int(m), int(d))
 
         @staticmethod
         def to_xml(element, value):
-            element.text = value.format('YYYY.M.D')
+            element.text = f'{value.year}.{value.month}.{value.day}'
 
     class HtmlTag(TextTag):
 
@@ -187,15 +296,23 @@ class Xml:
         def to_str(value):
             return value
 
+    class InternedTextAttrib(TextAttrib):
+        # For attributes that are drawn from a small vocabulary (e.g. feature 
+        # types), so that every object can share the same few strings.
+
+        @staticmethod
+        def from_str(str):
+            return sys.intern(str)
+
     class BoolAttrib:
 
         @staticmethod
         def from_str(str):
-            return {'0': False, '1': True}[str]
+            return _bool_from_str[str]
 
         @staticmethod
         def to_str(value):
-            return str(int(value))
+            return '1' if value else '0'
 
     class EnumAttrib:
         value_from_str = {}
@@ -232,11 +349,11 @@ class Xml:
             return str(value)
 
     def __init__(self, **kwargs):
-        for name, value in self._defaults.items():
-            setattr(self, name, deepcopy(value))
+        for name, factory in self._default_factories:
+            setattr(self, name, factory())
 
         for name, value in kwargs.items():
-            if name in self._defined_names:
+            if name in self._defined_name_set:
                 setattr(self, name, value)
             else:
                 did_you_mean = '\n    '.join(self._defined_names)
@@ -244,51 +361,69 @@ class Xml:
 
         # Keep track of unexpected attributes and subtags, so that we can write 
         # everything we read, even if we don't understand it all.
-        self._unparsed_attribs = {}
-        self._unparsed_subtags = []
+        self._unparsed_attribs = _no_unparsed_attribs
+        self._unparsed_subtags = _no_unparsed_subtags
 
     def __init_subclass__(cls):
         super().__init_subclass__()
 
-        def find_dups(xs):
-            seen = set()
-            dups = set()
-
-            for x in xs:
-                if x in seen:
-                    dups.add(x)
-                seen.add(x)
-
-            return dups
-
-        def check_dups(xs):
-            dups = find_dups(xs)
-            if dups:
-                dups_str = '\n    '.join(dups)
-                raise ValueError("The following attributes are defined more than once:\n    {dups_str}")
-
         cls._defaults = {
                 defs[0]: defs[3]
                 for defs in cls.xml_attrib_defs + cls.xml_subtag_defs
                 if len(defs) == 4
         }
 
-        cls._attrib_parsers_by_name = {
-                name: (attrib, parser)
-                for name, attrib, parser, *_ in cls.xml_attrib_defs
-        }
-        cls._attrib_parsers_by_attrib = {
-                attrib: (name, parser)
+        # Every object needs its own copy of any mutable defaults, but 
+        # `deepcopy()` is slow and almost all of the defaults are empty lists 
+        # or dicts, so work out the cheapest way to copy each one up front.
+        def make_factory(value):
+            if isinstance(value, _immutable_types):
+                return lambda: value
+            if type(value) in (list, dict) and not value:
+                return type(value)
+            return lambda: deepcopy(value)
+
+        cls._default_factories = tuple(
+                (name, make_factory(value))
+                for name, value in cls._defaults.items()
+        )
+
+        # Resolve the `from_str()`/`from_xml()` methods up front, because 
+        # these lookups are otherwise repeated for every attribute and subtag 
+        # of every element parsed.
+        cls._attrib_from_str_by_attrib = {
+                attrib: (name, parser.from_str)
                 for name, attrib, parser, *_ in cls.xml_attrib_defs
         }
-        cls._subtag_parsers_by_name = {
-                name: (tag, parser)
+        cls._subtag_readers_by_tag = {
+                tag: (name, parser.from_xml, getattr(parser, 'setattr', setattr))
                 for name, tag, parser, *_ in cls.xml_subtag_defs
         }
-        cls._subtag_parsers_by_tag = {
-                tag: (name, parser)
+
+        # Flat tuples of everything `to_xml()` needs, in declaration order, so 
+        # that the parser methods don't have to be looked up for every object.
+        cls._attrib_writers = tuple(
+                (name, attrib, parser.to_str)
+                for name, attrib, parser, *_ in cls.xml_attrib_defs
+        )
+        #
+        # For most parsers, it's convenient if we take care of making the 
+        # element.  But a few of the more complex parsers need to customize 
+        # this process.  So we basically overload the 'to_xml()' method and 
+        # inspect the signature to see which behavior the parser wants.  
+        # `signature()` is slow, so this is only done once per class.
+        # 
+        # Note that we could've gotten similar behavior by having a superclass 
+        # method that creates the element and calls a overload-able method to 
+        # customize it.  But for aesthetic reasons, I don't want to require the 
+        # parsers to inherit from anything.
+        cls._subtag_writers = tuple(
+                (
+                    name, tag, parser.to_xml,
+                    len(signature(parser.to_xml).parameters) == 2,
+                )
                 for name, tag, parser, *_ in cls.xml_subtag_defs
-        }
+        )
 
         cls._attrib_names = [
                 name for name, *_ in cls.xml_attrib_defs
@@ -297,11 +432,27 @@ class Xml:
                 name for name, *_ in cls.xml_subtag_defs
         ]
         cls._defined_names = cls._attrib_names + cls._subtag_names
-
-        check_dups(cls._defined_names)
+        cls._defined_name_set = frozenset(cls._defined_names)
+
+        if len(cls._defined_names) != len(cls._defined_name_set):
+            dups = sorted({
+                x for x in cls._defined_names
+                if cls._defined_names.count(x) > 1
+            })
+            dups_str = '\n    '.join(dups)
+            raise ValueError(f"The following attributes are defined more than once:\n    {dups_str}")
+
+        # Subclasses that declare `__slots__` need a slot for every attribute, 
+        # otherwise parsing will fail with a confusing error.
+        has_dict = any('__dict__' in vars(x) for x in cls.__mro__)
+        if not has_dict:
+            missing = [x for x in cls._defined_names if not hasattr(cls, x)]
+            if missing:
+                missing_str = '\n    '.join(missing)
+                raise ValueError(f"The following attributes have no slot:\n    {missing_str}")
 
     def __getattr__(self, name):
-        if name in self._defined_names:
+        if name in self._defined_name_set:
             raise AttributeError(f"'{name}' not defined for {self.__class__.__name__}.")
 
         else:
@@ -313,7 +464,7 @@ class Xml:
             super().__delattr__(name)
 
         except AttributeError:
-            if name in self._defined_names:
+            if name in self._defined_name_set:
                 raise AttributeError(f"'{name}' not defined for {self.__class__.__name__}.")
 
             else:
@@ -321,109 +472,161 @@ class Xml:
                 raise AttributeError(f"'{name}' is not a valid attribute of {self.__class__.__name__}, did you mean:\n    {did_you_mean}")
 
     def __eq__(self, other):
-        undef = object()
-        return all([
-            getattr(self, x, undef) == getattr(other, x, undef)
+        return all(
+            _getattr_or_undef(self, x) == _getattr_or_undef(other, x)
             for x in self._defined_names
-        ])
+        )
+
+    def clone(self):
+        """
+        Return a copy of this object.
+
+        This is much faster than `copy.deepcopy()`, but it only copies one 
+        level deep: any list or dict attributes are copied, but the objects 
+        they contain are shared with the original.  Subclasses with nested 
+        `Xml` objects should override this method to clone those as well.
+        """
+        clone = self.__class__.__new__(self.__class__)
+
+        for name in self._defined_names:
+            if hasattr(self, name):
+                setattr(clone, name, copy(getattr(self, name)))
+
+        clone._unparsed_attribs = _no_unparsed_attribs
+        clone._unparsed_subtags = _no_unparsed_subtags
+
+        if self._unparsed_attribs:
+            clone._unparsed_attribs = self._unparsed_attribs.copy()
+        if self._unparsed_subtags:
+            clone._unparsed_subtags = self._unparsed_subtags.copy()
+
+        return clone
 
 
     @classmethod
     def from_bytes(cls, bytes):
-        xml = bytes.decode('utf8')
-        root = etree.fromstring(xml)
+        if cls.xml_stream:
+            return cls._from_xml_stream(BytesIO(bytes))
+
+        # Let expat decode the bytes itself, rather than making a str copy of 
+        # the whole document first.
+        root = etree.fromstring(bytes)
         return cls.from_xml(root)
 
     @classmethod
     def from_xml(cls, root):
+        self = cls._from_xml_attribs(root)
+
+        for element in root:
+            self._parse_xml_subtag(element)
+
+        return self
+
+    @classmethod
+    def _from_xml_stream(cls, stream):
+        # Each subtag is parsed as soon as its end tag is reached, then 
+        # discarded, so the whole tree never has to be in memory at once.
+        depth = 0
+
+        for event, element in etree.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = element
+                    self = cls._from_xml_attribs(root)
+
+            else:
+                depth -= 1
+                if depth == 1:
+                    self._parse_xml_subtag(element)
+                    root.remove(element)
+
+        return self
+
+    @classmethod
+    def _from_xml_attribs(cls, root):
         if not cls.xml_tag:
             raise NotImplementedError(f"'{cls.__qualname__}.xml_tag' not defined.")
         if root.tag != cls.xml_tag:
-            raise ValueError(f"expected <{self.xml_tag}>, but got {root}")
+            raise ValueError(f"expected <{cls.xml_tag}>, but got {root}")
 
         self = cls()
 
-        for attrib in root.attrib:
-            try:
-                name, parser = cls._attrib_parsers_by_attrib[attrib]
-            except KeyError:
-                self._unparsed_attribs[attrib] = root.attrib[attrib]
-            else:
-                value = parser.from_str(root.attrib[attrib])
-                setattr(self, name, value)
+        from_str_by_attrib = cls._attrib_from_str_by_attrib
 
-        for element in root:
+        for attrib, str in root.attrib.items():
             try:
-                name, parser = cls._subtag_parsers_by_tag[element.tag]
+                name, from_str = from_str_by_attrib[attrib]
             except KeyError:
-                self._unparsed_subtags.append(element)
+                if self._unparsed_attribs is _no_unparsed_attribs:
+                    self._unparsed_attribs = {}
+                self._unparsed_attribs[attrib] = str
             else:
-                value = parser.from_xml(element)
-                getattr(parser, 'setattr', setattr)(self, name, value)
+                setattr(self, name, from_str(str))
 
         return self
 
+    def _parse_xml_subtag(self, element):
+        try:
+            name, from_xml, setattr_ = self._subtag_readers_by_tag[element.tag]
+        except KeyError:
+            if self._unparsed_subtags is _no_unparsed_subtags:
+                self._unparsed_subtags = []
+            self._unparsed_subtags.append(element)
+        else:
+            setattr_(self, name, from_xml(element))
+
     def to_bytes(self):
         root = self.to_xml()
         return etree.tostring(root)
 
     def to_xml(self):
-        from inspect import signature
-
         if not self.xml_tag:
             raise NotImplementedError("'{self.__class__.__qualname__}.xml_tag' not defined.")
 
         root = etree.Element(self.xml_tag)
-
-        def has_default_value(name):
-            # In some cases, the absence of an attribute/subtag implies some 
-            # default value.  This function is used to avoid writing 
-            # attributes/subtags with such default values.
-            if name in self._defaults:
-                return getattr(self, name) == self._defaults[name]
-            else:
-                return False
+        defaults = self._defaults
+
+        def get_value_to_write(name):
+            # Return `_undef` if the given attribute/subtag shouldn't be 
+            # written.  That's the case if it was never set, or if it has a 
+            # default value (i.e. a value implied by its absence).
+            value = _getattr_or_undef(self, name)
+            if name in defaults and value == defaults[name]:
+                return _undef
+            return value
 
         for attrib, value in self._unparsed_attribs.items():
             root.attrib[attrib] = value
 
-        for name in self._attrib_names:
-            if not hasattr(self, name): continue
-            if has_default_value(name): continue
-            attrib, parser = self._attrib_parsers_by_name[name]
-            value = getattr(self, name)
-            root.attrib[attrib] = parser.to_str(value)
+        for name, attrib, to_str in self._attrib_writers:
+            value = get_value_to_write(name)
+            if value is _undef: continue
+            root.attrib[attrib] = to_str(value)
 
         for element in self._unparsed_subtags:
             root.append(element)
 
-        for name in self._subtag_names:
-            if not hasattr(self, name): continue
-            if has_default_value(name): continue
-            tag, parser = self._subtag_parsers_by_name[name]
-            sig = signature(parser.to_xml)
-
-            # For most parsers, it's convenient if we take care of making the 
-            # element.  But a few of the more complex parsers need to customize 
-            # this process.  So we basically overload the 'to_xml()' method and 
-            # inspect the signature to see which behavior the parser wants.
-            # 
-            # Note that we could've gotten similar behavior by having a 
-            # superclass method that creates the element and calls a 
-            # overload-able method to customize it.  But for aesthetic reasons, 
-            # I don't want to require the parsers to inherit from anything.
-
-            if len(sig.parameters) == 2:
+        for name, tag, to_xml, make_element in self._subtag_writers:
+            value = get_value_to_write(name)
+            if value is _undef: continue
+
+            if make_element:
                 element = etree.SubElement(root, tag)
-                parser.to_xml(element, getattr(self, name))
+                to_xml(element, value)
             else:
-                parser.to_xml(root, tag, getattr(self, name))
+                to_xml(root, tag, value)
 
         return root
 
 class Block(Repr):
     block_classes = {}
 
+    # Whether or not `blocks_from_bytes()` can put off parsing this block 
+    # until it's needed.  This should be disabled for blocks that are trivial 
+    # to parse, or that need to be parsed to validate the file.
+    defer_parsing = True
+
     def __init_subclass__(cls):
         super().__init_subclass__()
 
@@ -450,6 +653,7 @@ class Block(Repr):
 
 class UnparsedBlock(Block):
     repr_attrs = ['bytes']
+    defer_parsing = False
 
     def __repr_attr__(self, attr):
         if attr == 'bytes':
@@ -473,4 +677,29 @@ class UndocumentedBlock(UnparsedBlock):
     pass
 
 
+class DeferredBlock(Block):
+    """
+    A placeholder for a block that hasn't been parsed yet.
+
+    The raw bytes are kept, so the block can be written back to a file 
+    unchanged without ever being parsed.
+    """
+    repr_attrs = ['cls']
+
+    def __init__(self, cls):
+        self.cls = cls
+
+    def __repr_attr__(self, attr):
+        if attr == 'cls':
+            return self.cls.__name__
+        else:
+            return super().__repr_attr__(attr)
+
+    def parse(self):
+        return block_from_bytes(self.cls, self.block_id, self.bytes)
+
+    def to_bytes(self):
+        return self.bytes
+
+
 
@@ -1,13 +1,20 @@
 #!/usr/bin/env python3
 
+# Build the translation tables once, rather than every time a sequence is 
+# complemented.
+_BASES = 'ACTGactg'
+_COMPLEMENTS = 'TGACtgac'
+_STR_COMPLEMENTS = str.maketrans(_BASES, _COMPLEMENTS)
+_BYTES_COMPLEMENTS = bytes.maketrans(_BASES.encode(), _COMPLEMENTS.encode())
+
 def reverse(sequence):
     return sequence[::-1]
 
 def complement(sequence):
-    complements = str.maketrans('ACTGactg', 'TGACtgac')
-    return sequence.translate(complements)
+    if isinstance(sequence, (bytes, bytearray)):
+        return sequence.translate(_BYTES_COMPLEMENTS)
+    else:
+        return sequence.translate(_STR_COMPLEMENTS)
 
 def reverse_complement(sequence):
     return reverse(complement(sequence))
-
-
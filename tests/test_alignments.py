@@ -3,12 +3,15 @@
 import pytest
 import autosnapgene as snap
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 def test_getters(parse_and_write):
     for dna in parse_and_write('puc19_bsai_abc.dna'):
         assert dna.count_traces() == count_seq_blocks(dna) == 3
         assert dna.trace_names == [
                 'puc19_bsai_a', 'puc19_bsai_b', 'puc19_bsai_c']
+        assert [x.trimmed_range for x in dna.traces] == [
+                (130, 1030), (56, 1041), (21, 1046)]
 
 @pytest.mark.parametrize(
         'path, count', [
@@ -138,6 +141,47 @@ def test_prepend_trace(examples):
     assert dna.trace_names == [
             'puc19_bsai_b', 'puc19_bsai_b', 'puc19_bsai_a', 'puc19_bsai_a']
 
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor])
+def test_append_prepend_traces(examples, executor):
+    dna = snap.parse(examples / 'puc19_bsai.dna')
+    dna.append_trace(examples / 'puc19_bsai_b.ab1')
+    assert dna.trace_names == ['puc19_bsai_b']
+
+    ex = executor() if executor else None
+
+    dna.append_traces([
+        examples / 'puc19_bsai_c.ab1',
+        examples / 'puc19_bsai_a.ab1',
+    ], executor=ex)
+    dna.prepend_traces([
+        examples / 'puc19_bsai_a.ab1',
+        examples / 'puc19_bsai_c.ab1',
+    ], executor=ex)
+
+    if ex:
+        ex.shutdown()
+
+    assert dna.count_traces() == count_seq_blocks(dna) == 5
+    assert dna.trace_names == [
+            'puc19_bsai_a', 'puc19_bsai_c', 'puc19_bsai_b',
+            'puc19_bsai_c', 'puc19_bsai_a']
+    assert [x.sort_order for x in dna.traces] == [0, 1, 2, 3, 4]
+
+def test_append_traces_conversion_error(examples, monkeypatch):
+    dna = snap.parse(examples / 't7_promoter.dna')
+    before = list(dna.blocks)
+
+    def ztr_from_file(path):
+        raise RuntimeError("conversion failed")
+
+    monkeypatch.setattr(snap.parser, 'ztr_from_file', ztr_from_file)
+
+    with pytest.raises(RuntimeError):
+        dna.append_traces([examples / 'puc19_bsai_a.ab1'])
+
+    assert dna.blocks == before
+    assert dna.count_traces() == 0
+
 def test_insert_trace(examples):
     dna = snap.parse(examples / 'puc19_bsai_ab.dna')
     assert dna.count_traces() == count_seq_blocks(dna) == 2
@@ -184,6 +228,31 @@ def test_remove_trace_dups(examples):
     assert dna.trace_names == [
             'puc19_bsai_b']
 
+def test_remove_traces(examples):
+    dna = snap.parse(examples / 'puc19_bsai_abc.dna')
+
+    with pytest.raises(ValueError):
+        dna.remove_traces(['puc19_bsai_a', 'xxx'])
+
+    assert dna.count_traces() == count_seq_blocks(dna) == 3
+
+    dna.remove_traces(['puc19_bsai_a', examples / 'puc19_bsai_c.ab1'])
+    assert dna.count_traces() == count_seq_blocks(dna) == 1
+    assert dna.trace_names == [
+            'puc19_bsai_b']
+
+def test_rename_trace(examples):
+    dna = snap.parse(examples / 'puc19_bsai_ab.dna')
+    assert dna.trace_names == [
+            'puc19_bsai_a', 'puc19_bsai_b']
+
+    dna.rename_trace('puc19_bsai_b', 'puc19_bsai_c')
+    assert dna.trace_names == [
+            'puc19_bsai_a', 'puc19_bsai_c']
+
+    with pytest.raises(ValueError):
+        dna.rename_trace('xxx', 'yyy')
+
 def test_replace_target(examples):
     dna = snap.parse(examples / 'puc19_bsai_ab.dna')
     assert dna.count_traces() == count_seq_blocks(dna) == 2
@@ -207,6 +276,29 @@ def test_replace_target_dups(examples):
     assert dna.trace_names == [
             'puc19_bsai_c', 'puc19_bsai_b']
 
+def test_next_id(examples):
+    dna = snap.parse(examples / 'puc19_bsai_abc.dna')
+    align_block = dna.find_block(snap.blocks.AlignmentsBlock)
+    assert align_block.next_id == 3
+
+    dna.remove_trace('puc19_bsai_a')
+    assert align_block.next_id == 2
+
+    dna.remove_trace('puc19_bsai_b')
+    dna.remove_trace('puc19_bsai_c')
+    assert align_block.next_id == 1
+
+    # Replacing the metadata must not leave a stale id behind.
+    meta = snap.AlignmentMetadata(id=5)
+    align_block.metadata = [meta]
+    assert align_block.next_id == 6
+
+def test_pick_trace(examples):
+    dna = snap.parse(examples / 'puc19_bsai_abc.dna')
+
+    dna.pick_trace('puc19_bsai_b')
+    assert [x.is_visible for x in dna.traces] == [False, True, False]
+
 def test_sort_traces(examples):
     dna = snap.parse(examples / 'puc19_bsai_abc.dna')
     assert dna.count_traces() == count_seq_blocks(dna) == 3
@@ -233,9 +325,15 @@ def test_clear_traces(examples):
     assert dna.count_traces() == count_seq_blocks(dna) == 0
     assert dna.trace_names == []
 
-def test_extract_traces(examples, tmp_path):
+@pytest.mark.parametrize('executor', [None, ThreadPoolExecutor])
+def test_extract_traces(examples, tmp_path, executor):
     dna = snap.parse(examples / 'puc19_bsai_abc.dna')
-    dna.extract_traces(tmp_path)
+
+    if executor:
+        with executor() as ex:
+            dna.extract_traces(tmp_path, executor=ex)
+    else:
+        dna.extract_traces(tmp_path)
 
     assert (tmp_path / 'puc19_bsai_a.ztr').exists()
     assert (tmp_path / 'puc19_bsai_b.ztr').exists()
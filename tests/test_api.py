@@ -49,3 +49,81 @@ def test_getters_same_after_write(getter, examples, parse_and_write):
         assert in_value == out_value
 
 
+def test_find_blocks_after_edit(examples):
+    dna = snap.parse(examples / 't7_promoter.dna')
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 1
+
+    dna.clear_features()
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 0
+
+    dna.make_block(snap.blocks.FeaturesBlock)
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 1
+
+    dna.blocks = []
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 0
+
+def test_find_blocks_after_in_place_edit(examples):
+    dna = snap.parse(examples / 't7_promoter.dna')
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 1
+
+    dna.blocks.append(snap.blocks.FeaturesBlock())
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 2
+
+    i = dna.blocks.index(dna.find_blocks(snap.blocks.FeaturesBlock)[0])
+    del dna.blocks[i]
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 1
+
+    dna.blocks[:] = []
+    assert len(dna.find_blocks(snap.blocks.FeaturesBlock)) == 0
+
+
+def test_restriction_sites(examples):
+    dna = snap.parse(examples / 'puc19.dna')
+    block = dna.find_block(snap.blocks.RestrictionDigestBlock)
+    bytes = block.to_bytes()
+
+    # Decoding the sites shouldn't change the block.
+    assert len(block.sites) == 469
+    assert block.to_bytes() == bytes
+
+    block.sites.append('GATTACA')
+    assert block.to_bytes() != bytes
+
+def test_parse_executor(examples):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(2) as executor:
+        dna = snap.parse(examples / 'puc19.dna', executor=executor)
+
+    assert not any(
+            isinstance(x, snap.parser.DeferredBlock)
+            for x in dna._blocks
+    )
+    assert dna.sequence == snap.parse(examples / 'puc19.dna').sequence
+
+def test_lazy_package_attributes():
+    import sys
+    from subprocess import run
+
+    # Use a fresh interpreter, so none of the submodules have been imported 
+    # yet.
+    code = '''\
+import autosnapgene as snap
+assert snap.api.__name__ == 'autosnapgene.api'
+assert snap.errors.__name__ == 'autosnapgene.errors'
+assert snap.util.__name__ == 'autosnapgene.util'
+assert snap.SnapGene is snap.api.SnapGene
+
+try:
+    snap.not_an_attribute
+except AttributeError:
+    pass
+else:
+    raise AssertionError
+
+ns = {}
+exec('from autosnapgene import *', ns)
+for name in ['api', 'errors', 'util', 'parse', 'SnapGene', 'Feature', 'ParseError']:
+    assert name in ns, name
+'''
+    run([sys.executable, '-c', code], check=True)
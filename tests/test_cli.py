@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import sys
+import pytest
+import autosnapgene as snap
+from autosnapgene import cli
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['autosnapgene', *map(str, args)])
+    cli.main()
+
+def test_trace_append(examples, tmp_path, monkeypatch):
+    out = tmp_path / 'out.dna'
+    run_cli(monkeypatch,
+            'trace', 'append', examples / 'puc19_bsai.dna',
+            examples / 'puc19_bsai_a.ab1',
+            examples / 'puc19_bsai_b.ab1',
+            '-o', out,
+    )
+    assert snap.parse(out).trace_names == ['puc19_bsai_a', 'puc19_bsai_b']
+
+def test_trace_prepend(examples, tmp_path, monkeypatch):
+    # Each trace is prepended in turn, so the last one given ends up first.
+    out = tmp_path / 'out.dna'
+    run_cli(monkeypatch,
+            'trace', 'prepend', examples / 'puc19_bsai.dna',
+            examples / 'puc19_bsai_a.ab1',
+            examples / 'puc19_bsai_b.ab1',
+            '-o', out,
+    )
+    assert snap.parse(out).trace_names == ['puc19_bsai_b', 'puc19_bsai_a']
+
+def test_trace_remove(examples, tmp_path, monkeypatch):
+    out = tmp_path / 'out.dna'
+    run_cli(monkeypatch,
+            'trace', 'remove', examples / 'puc19_bsai_abc.dna',
+            'puc19_bsai_a', 'puc19_bsai_c',
+            '-o', out,
+    )
+    assert snap.parse(out).trace_names == ['puc19_bsai_b']
+
+def test_trace_remove_duplicate(examples, tmp_path, monkeypatch):
+    # Each name is removed in turn, so the second copy of a name doesn't match
+    # any trace.
+    out = tmp_path / 'out.dna'
+
+    with pytest.raises(ValueError):
+        run_cli(monkeypatch,
+                'trace', 'remove', examples / 'puc19_bsai_abc.dna',
+                'puc19_bsai_a', 'puc19_bsai_a',
+                '-o', out,
+        )
+
+    assert not out.exists()
+
+@pytest.mark.parametrize(
+        'option, expected', [
+            ([], "b'SnapGene"),
+            (['-b'], 'SnapGene'),
+])
+def test_debug_dump_blocks(examples, monkeypatch, option, expected):
+    from io import StringIO
+
+    # Make sure this works even if stdout doesn't have a binary buffer.
+    stdout = StringIO()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+
+    run_cli(monkeypatch,
+            'debug', 'dump-blocks', examples / 't7_promoter.dna',
+            '-i', '0', *option,
+    )
+    assert stdout.getvalue().startswith(expected)
+
+def test_debug_dump_blocks_xml(examples, capsysbinary, monkeypatch):
+    run_cli(monkeypatch,
+            'debug', 'dump-blocks', examples / 't7_promoter.dna',
+            '-I', '10', '-x',
+    )
+    out = capsysbinary.readouterr().out
+    assert b'<Features' in out
@@ -40,6 +40,13 @@ def test_getters(parse_and_write):
         assert dna.is_dcm_methylated == False
         assert dna.is_ecoki_methylated == False
 
+def test_getters_sequence_bytes(examples):
+    dna = snap.parse(examples / 't7_promoter.dna')
+    assert dna.sequence_bytes == b'TAATACGACTCACTATAGG'
+
+    dna.sequence_bytes = dna.sequence_bytes.lower()
+    assert dna.sequence == 'taatacgactcactatagg'
+
 def test_setters():
     dna = snap.SnapGene()
     dna.dna_sequence = 'TAATACGACTCACTATAGG'
@@ -71,3 +78,23 @@ def test_to_bytes(bytes, params):
     dna.is_ecoki_methylated = params[5]
 
     assert dna.to_bytes() == bytes
+
+def test_upper_sequence():
+    dna = snap.blocks.DnaBlock()
+
+    dna.sequence = 'taatacgactcactatagg'
+    assert dna.upper_sequence == 'TAATACGACTCACTATAGG'
+
+    # Make sure the cached value is updated when the sequence changes.
+    dna.sequence = 'gattaca'
+    assert dna.upper_sequence == 'GATTACA'
+
+def test_sequence_bytes():
+    dna = snap.blocks.DnaBlock.from_bytes(b'\x00ATCG')
+
+    # The sequence shouldn't need to be decoded to write the block.
+    assert dna.to_bytes() == b'\x00ATCG'
+    assert dna.sequence == 'ATCG'
+
+    dna.sequence = 'GATTACA'
+    assert dna.to_bytes() == b'\x00GATTACA'
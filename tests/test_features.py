@@ -122,6 +122,56 @@ def test_qualifiers(xml, expected):
     root = feat.to_xml()
     assert etree.tostring(root) == xml
 
+def test_clone(examples):
+    dna = snap.parse(examples / 'flag_tag.dna')
+    feat = dna.get_feature("FLAG")
+    clone = feat.clone()
+
+    assert clone == feat
+    assert clone is not feat
+    assert clone.segment is not feat.segment
+    assert clone.qualifiers is not feat.qualifiers
+
+    clone.segment.range = 2, 18
+    clone.qualifiers['note'] = "Blah"
+
+    assert feat.segment.range == (0, 24)
+    assert 'note' not in feat.qualifiers
+
+def test_clone_multi_value_qualifier():
+    feat = snap.Feature()
+    feat.qualifiers['note'] = ['a', 'b']
+    clone = feat.clone()
+
+    assert clone.qualifiers == feat.qualifiers
+    assert clone.qualifiers['note'] is not feat.qualifiers['note']
+
+    clone.qualifiers['note'].append('c')
+    assert feat.qualifiers['note'] == ['a', 'b']
+
+def test_defaults_not_shared():
+    f1 = snap.Feature()
+    f2 = snap.Feature()
+
+    assert f1.segments == f2.segments == []
+    assert f1.qualifiers == f2.qualifiers == {}
+    assert f1.segments is not f2.segments
+    assert f1.qualifiers is not f2.qualifiers
+
+def test_slots(examples):
+    dna = snap.parse(examples / 'puc19.dna')
+
+    for feat in dna.features:
+        assert not hasattr(feat, '__dict__')
+        assert not any(hasattr(x, '__dict__') for x in feat.segments)
+
+def test_interned_strings(examples):
+    dna = snap.parse(examples / 'puc19.dna')
+    types = {}
+
+    for feat in dna.features:
+        assert types.setdefault(feat.type, feat.type) is feat.type
+
 def test_get_feature(examples):
     dna = snap.parse(examples / 't7_promoter.dna')
     feat = dna.get_feature("T7 promoter")
@@ -158,6 +208,22 @@ def test_add_feature(examples):
     dna.add_feature(feat)
     assert dna.count_features() == 2
 
+def test_add_feature_seq(examples):
+    dna = snap.parse(examples / 't7_promoter.dna')
+    assert dna.count_features() == 1
+
+    # 'ata' appears twice, and matching should be case-insensitive.
+    feat = snap.Feature()
+    feat.name = 'Blah'
+
+    new_feats = dna.add_feature(feat, 'ata')
+    assert len(new_feats) == 2
+    assert [x.id for x in new_feats] == [1, 2]
+    assert dna.count_features() == 3
+
+    with pytest.raises(snap.SequenceNotFound):
+        dna.add_feature(feat, 'GGGGGG')
+
 def test_remove_feature(examples):
     dna = snap.parse(examples / 't7_promoter.dna')
     assert dna.count_features() == 1
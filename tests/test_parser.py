@@ -59,6 +59,9 @@ class DummyXml(Xml):
             ('default_tag', 'Default', Xml.TextTag, ''),
     ]
 
+class DummyStreamXml(DummyXml):
+    xml_stream = True
+
 @pytest.mark.parametrize(
         'bytes, expected', [(
                 b'', [
@@ -107,6 +110,56 @@ def test_blocks_from_file(examples):
     pprint(blocks)
     assert len(blocks) == 10
 
+def test_blocks_from_file_mmap(examples, tmp_path, monkeypatch):
+    path = examples / 't7_promoter.dna'
+    expected = snap.parser.blocks_from_file(path)
+
+    monkeypatch.setattr(snap.parser, 'MMAP_THRESHOLD', 0)
+    blocks = snap.parser.blocks_from_file(path)
+
+    assert [x.bytes for x in blocks] == [x.bytes for x in expected]
+    assert all(type(x.bytes) is bytes for x in blocks)
+
+    # Make sure the map is closed properly even if the file is truncated.
+    truncated = tmp_path / 'truncated.dna'
+    truncated.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(snap.ParseError):
+        snap.parser.blocks_from_file(truncated)
+
+def test_blocks_from_file_executor(examples):
+    from concurrent.futures import ProcessPoolExecutor
+
+    serial = snap.parser.blocks_from_file(examples / 'puc19.dna')
+
+    with ProcessPoolExecutor(2) as executor:
+        parallel = snap.parser.blocks_from_file(
+                examples / 'puc19.dna', executor=executor)
+
+    assert len(parallel) == len(serial)
+
+    for a, b in zip(serial, parallel):
+        assert type(a) is type(b)
+        assert a.block_id == b.block_id
+        assert a.to_bytes() == b.to_bytes()
+
+def test_blocks_from_file_lazy(examples):
+    blocks = snap.parser.blocks_from_file(examples / 't7_promoter.dna', lazy=True)
+    pprint(blocks)
+    assert len(blocks) == 10
+
+    # The header is always parsed, because it's needed to validate the file.
+    assert isinstance(blocks[0], snap.blocks.HeaderBlock)
+
+    deferred = [x for x in blocks if isinstance(x, snap.parser.DeferredBlock)]
+    assert deferred
+
+    for block in deferred:
+        parsed = block.parse()
+        assert isinstance(parsed, block.cls)
+        assert parsed.block_id == block.block_id
+        assert parsed.bytes == block.bytes
+
 @pytest.mark.parametrize(
         'xml, raw_expected', [(
                 b'<Dummy />', {
@@ -166,14 +219,15 @@ def test_blocks_from_file(examples):
                 b'<Dummy><Unknown>!@#$</Unknown></Dummy>', {
             })
 ])
-def test_xml_parse_and_write(xml, raw_expected):
+@pytest.mark.parametrize('cls', [DummyXml, DummyStreamXml])
+def test_xml_parse_and_write(cls, xml, raw_expected):
     expected = {
             'default_attrib': '',
             'default_tag': '',
             **raw_expected
     }
 
-    x = DummyXml.from_bytes(xml)
+    x = cls.from_bytes(xml)
     for attr, value in expected.items():
         assert getattr(x, attr) == value
 
@@ -185,3 +239,68 @@ def test_xml_parse_and_write(xml, raw_expected):
     assert x.to_bytes() == xml
 
 
+
+def test_xml_slots():
+    x = snap.blocks.AlignmentMetadata.from_bytes(b'<Sequence ID="1" name="a"/>')
+    assert not hasattr(x, '__dict__')
+    assert x.id == 1
+    assert x.name == 'a'
+
+    with pytest.raises(AttributeError):
+        x.sort_order
+
+    with pytest.raises(ValueError, match='no slot'):
+        class MissingSlot(Xml):
+            __slots__ = ('a',)
+            xml_tag = 'MissingSlot'
+            xml_attrib_defs = [
+                    ('a', 'a', Xml.TextAttrib),
+                    ('b', 'b', Xml.TextAttrib),
+            ]
+
+def test_xml_dups():
+    with pytest.raises(ValueError, match='more than once:\n    a'):
+        class DupAttrib(Xml):
+            xml_tag = 'DupAttrib'
+            xml_attrib_defs = [
+                    ('a', 'a', Xml.TextAttrib),
+                    ('b', 'b', Xml.TextAttrib),
+            ]
+            xml_subtag_defs = [
+                    ('a', 'A', Xml.TextTag),
+            ]
+
+@pytest.mark.parametrize(
+        'xml_1, xml_2, expected', [
+            (b'<Sequence ID="1" name="a"/>', b'<Sequence ID="1" name="a"/>', True),
+            (b'<Sequence ID="1" name="a"/>', b'<Sequence ID="1" name="b"/>', False),
+            (b'<Sequence ID="1" name="a"/>', b'<Sequence ID="1"/>', False),
+            (b'<Sequence ID="1"/>', b'<Sequence name="a"/>', False),
+])
+def test_xml_eq(xml_1, xml_2, expected):
+    x1 = snap.blocks.AlignmentMetadata.from_bytes(xml_1)
+    x2 = snap.blocks.AlignmentMetadata.from_bytes(xml_2)
+    assert (x1 == x2) is expected
+    assert (x2 == x1) is expected
+
+@pytest.mark.parametrize('cls', [DummyXml, DummyStreamXml])
+def test_xml_unparsed(cls):
+    xml = b'<Dummy unknown="a"><Unknown /></Dummy>'
+
+    x = cls.from_bytes(xml)
+    assert x.to_bytes() == xml
+    assert x.clone().to_bytes() == xml
+
+    # The objects without anything unparsed must not be affected.
+    assert cls().to_bytes() == b'<Dummy />'
+    assert cls.from_bytes(b'<Dummy />').to_bytes() == b'<Dummy />'
+
+def test_repr():
+    x = snap.Feature()
+    assert repr(x) == '<Feature>'
+
+    x.type = 'CDS'
+    assert repr(x) == '<Feature type="CDS">'
+
+    x.name = 'a'
+    assert repr(x) == '<Feature name="a" type="CDS">'
@@ -30,6 +30,9 @@ def test_reverse(given, expected):
             ('AC', 'TG'),
             ('ACT', 'TGA'),
             ('ACTG', 'TGAC'),
+
+            # Anything else is left alone.
+            ('ACTGN', 'TGACN'),
         ],
 )
 @pytest.mark.parametrize(
@@ -58,3 +61,5 @@ def test_complement(given, expected, f):
 def test_reverse_complement(given, expected):
     assert util.reverse_complement(given) == expected
 
+def test_reverse_complement_bytes():
+    assert util.reverse_complement(b'ACTGn') == b'nCAGT'